@@ -11,7 +11,6 @@ def _evaluate_cla_files(report: RepoReport) -> None:
     """Evaluate CLA findings in files"""
     if report.cla_files:
         report.red_flags.append("cla")
-        cla_filelist = [finding["file"] for finding in report.cla_files]
         report.analysis.append(
             {
                 "category": "Licensing",
@@ -19,7 +18,7 @@ def _evaluate_cla_files(report: RepoReport) -> None:
                 "severity": "red",
                 "indicator": (
                     "A mention of Contributor License Agreements in the following file(s): "
-                    f"{', '.join(cla_filelist)}"
+                    f"{', '.join(finding['file'] for finding in report.cla_files)}"
                 ),
             }
         )
@@ -52,7 +51,6 @@ def _evaluate_dco_files(report: RepoReport) -> None:
     """Evaluate DCO findings in files"""
     if report.dco_files:
         report.green_flags.append("dco")
-        dco_filelist = [finding["file"] for finding in report.dco_files]
         report.analysis.append(
             {
                 "category": "Licensing",
@@ -60,7 +58,7 @@ def _evaluate_dco_files(report: RepoReport) -> None:
                 "severity": "green",
                 "indicator": (
                     "A mention of Developer Certificate of Origin in the following file(s): "
-                    f"{', '.join(dco_filelist)}"
+                    f"{', '.join(finding['file'] for finding in report.dco_files)}"
                 ),
             }
         )
@@ -93,7 +91,6 @@ def _evaluate_inoutbound_files(report: RepoReport) -> None:
     """Evaluate inbound=outbound findings in files"""
     if report.inoutbound_files:
         report.green_flags.append("inbound=outbound")
-        inoutbound_filelist = [finding["file"] for finding in report.inoutbound_files]
         report.analysis.append(
             {
                 "category": "Licensing",
@@ -101,7 +98,7 @@ def _evaluate_inoutbound_files(report: RepoReport) -> None:
                 "severity": "green",
                 "indicator": (
                     "A mention of inbound=outbound in the following file(s): "
-                    f"{', '.join(inoutbound_filelist)}"
+                    f"{', '.join(finding['file'] for finding in report.inoutbound_files)}"
                 ),
             }
         )
@@ -234,8 +231,9 @@ def _evaluate_commit_date(report: RepoReport) -> None:
 
 def analyse_report(report: RepoReport, ignorelist: list) -> None:
     """Analyse the report and evaluate the findings"""
-    # Add list of ignored findings to report
-    report.ignorelist_ = ignorelist
+    # Add ignored findings to report. Stored as a set as the evaluations only
+    # check for membership
+    report.ignorelist_ = frozenset(ignorelist)
 
     # Evaluate CLA findings in files
     _evaluate_cla_files(report)
@@ -260,3 +258,9 @@ def analyse_report(report: RepoReport, ignorelist: list) -> None:
 
     # Evaluate commit dates
     _evaluate_commit_date(report)
+
+    # Remove duplicate flags, e.g. a CLA found in both files and pull requests,
+    # while keeping their order
+    report.red_flags = list(dict.fromkeys(report.red_flags))
+    report.yellow_flags = list(dict.fromkeys(report.yellow_flags))
+    report.green_flags = list(dict.fromkeys(report.green_flags))
@@ -5,41 +5,52 @@
 """Check a repo for different stats about contributions"""
 
 import logging
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+from time import time
+from typing import Iterator, Tuple
 
 from git import Repo
-from github import NamedUser, PaginatedList
 
-from ._git import gh_api_call
-from ._matching import find_patterns_in_list
+from ._git import gh_api_get
 from ._report import RepoReport
 
-# Indicators in a user name that it's a bot
-BOT_KEYWORDS = [r"(?i)^renovate", r"(?i)^dependabot", r"(?i)^weblate$"]
+# Indicators in a user name that it's a bot, combined in one regex
+BOT_REGEX = re.compile(r"^renovate|^dependabot|^weblate$", re.IGNORECASE)
+
+# Used to convert Unix timestamps to days since epoch
+SECONDS_PER_DAY = 86400
+
+
+def _is_bot(name: str) -> bool:
+    """Check whether a user name indicates a bot"""
+    return BOT_REGEX.search(name) is not None
 
 
 def _get_contributor_stats(report: RepoReport) -> list:
     """Get contributor stats of a repo by GitHub API"""
 
-    repo = gh_api_call(report.github_, report.github_, "get_repo", full_name_or_id=report.shortname)
-
     # Get all contributors
     # Limit the list of contributors to 30 users (one API page) which is
     # completely sufficient
-    contributors: PaginatedList.PaginatedList[NamedUser.NamedUser] = gh_api_call(
-        report.github_, repo, "get_contributors"
-    )[:30]
+    contributors = gh_api_get(
+        report.github_,
+        f"/repos/{report.shortname}/contributors",
+        parameters={"per_page": 30},
+        cache=report.cache_,
+    )
 
     # Get stats for all contributors: login, type, contributions
+    # Note: an empty repository returns no content at all
     return [
         {
-            "login": str(c.login),
-            "type": c.type,
-            "contributions": int(c.contributions),
+            "login": str(c["login"]),
+            "type": c["type"],
+            "contributions": int(c["contributions"]),
             # deactivated because each name resolution costs another API call
-            # "name": c.name,
+            # "name": c["name"],
         }
-        for c in contributors
+        for c in contributors or []
     ]
 
 
@@ -54,7 +65,7 @@ def maintainer_dominance(report: RepoReport) -> None:
     human_contributors = []
     for contributor in contributors:
         bot_type = contributor["type"] == "Bot"
-        bot_name = find_patterns_in_list(BOT_KEYWORDS, contributor["login"])
+        bot_name = _is_bot(contributor["login"])
 
         # If not detected as human, remove unneeded keys and add to list
         if not bot_type and not bot_name:
@@ -93,52 +104,65 @@ def maintainer_dominance(report: RepoReport) -> None:
         report.maintainer_dominance = dominance
 
 
-def _extract_all_commits(directory) -> list:
-    """Extract all commits from a local Git repository"""
-    repo = Repo(directory)
-    mainbranch = repo.head.reference
-
-    commits = list(repo.iter_commits(rev=mainbranch))
-
-    # Get a list of all commits of the repo
-    return [
-        {
-            "name": str(c.author),
-            "email": c.author.email,
-            "date": datetime.utcfromtimestamp(c.authored_date).date(),
-            "hash": c.hexsha,
-        }
-        for c in commits
-    ]
-
-
-def _commit_date_diff(commits: list) -> int:
-    """Calculate the date difference in days between today and the last commit"""
+def _extract_all_commits(repo: Repo, rev) -> Iterator[Tuple[int, str]]:
+    """Extract the author timestamp and name of all commits from a local Git
+    repository. A single `git rev-list` call is much faster than letting GitPython
+    create a Commit object for each revision. Its output is streamed, so the log
+    of large repositories is not held in memory"""
+    # Other than `git log`, `git rev-list` ignores log.showSignature and other
+    # configuration that changes the output
+    process = repo.git.rev_list(rev, "--format=%at%x00%an", as_process=True)
+    for line in process.stdout:
+        timestamp, sep, name = line.decode("utf-8", errors="replace").rstrip("\n").partition("\x00")
+        # Skip the "commit <hash>" lines of rev-list and any other unexpected output
+        if not sep:
+            continue
+        yield int(timestamp), name
+
+    # Raise an error if git failed
+    process.wait()
+
+
+def _commit_date_diff(timestamp: int, author: str) -> int:
+    """Calculate the date difference in days between today and the commit
+    timestamp of the last commit"""
     # If no commits, return -1
-    if len(commits) == 0:
+    if not timestamp:
         return -1
 
-    # compare days difference between today and the last commit date
-    newest_commit_date, newest_commit_author = commits[0]["date"], commits[0]["name"]
-    logging.debug("Newest detected commit on %s by %s", newest_commit_date, newest_commit_author)
-    return (datetime.today().date() - newest_commit_date).days
+    logging.debug(
+        "Newest detected commit on %s by %s",
+        datetime.fromtimestamp(timestamp, timezone.utc).date(),
+        author,
+    )
+    # compare days since epoch of today and of the last commit date (both UTC)
+    return int(time()) // SECONDS_PER_DAY - timestamp // SECONDS_PER_DAY
 
 
 def old_commits(report: RepoReport):
     """Get the age in days of the newest commit made by a human in a repo"""
-    commits = _extract_all_commits(report.repodir_)
-
-    # Filter out commits by bots
-    human_commits = []
-    bot_commits = []
-    for commit in commits:
-        bot_name = find_patterns_in_list(BOT_KEYWORDS, commit["name"])
+    repo = Repo(report.repodir_)
+    mainbranch = repo.head.reference
 
-        # If not detected as human, add to list
+    # Only the newest commit of humans and bots is relevant, so track their
+    # timestamps and authors instead of keeping all commits
+    newest_human_ts, newest_human_author = 0, ""
+    newest_bot_ts, newest_bot_author = 0, ""
+    # Repositories have far fewer authors than commits, so only classify each
+    # author name once
+    is_bot_cache: dict = {}
+    for timestamp, name in _extract_all_commits(repo, mainbranch):
+        bot_name = is_bot_cache.get(name)
+        if bot_name is None:
+            bot_name = _is_bot(name)
+            is_bot_cache[name] = bot_name
+
+        # Filter out commits by bots
         if not bot_name:
-            human_commits.append(commit)
-        else:
-            bot_commits.append(commit)
+            if timestamp > newest_human_ts:
+                newest_human_ts, newest_human_author = timestamp, name
+        elif timestamp > newest_bot_ts:
+            newest_bot_ts, newest_bot_author = timestamp, name
 
-    report.days_since_last_human_commit = _commit_date_diff(human_commits)
-    report.days_since_last_bot_commit = _commit_date_diff(bot_commits)
+    report.days_since_last_human_commit = _commit_date_diff(newest_human_ts, newest_human_author)
+    report.days_since_last_bot_commit = _commit_date_diff(newest_bot_ts, newest_bot_author)
@@ -4,69 +4,121 @@
 
 """Git, GitHub and repository functions"""
 
-import fileinput
+import hashlib
+import json
 import logging
 import os
 import re
 import sys
+import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
 from shutil import rmtree
+from tempfile import mkstemp
 from time import sleep
 from typing import Optional
 
 from git import GitCommandError, Repo
-from github import BadCredentialsException, Github, RateLimitExceededException
+from github import (
+    BadCredentialsException,
+    Github,
+    GithubException,
+    RateLimitExceededException,
+)
 from platformdirs import user_cache_path
 
+# Maximum number of concurrent GitHub API calls when multiple repositories are
+# checked in parallel, so we do not run into GitHub's secondary rate limits
+GH_API_SEMAPHORE = threading.BoundedSemaphore(4)
+# Github objects per thread, see gh_thread_login()
+_GH_THREAD_LOCAL = threading.local()
+# Number of attempts of a GitHub API call in case of exceeded API limits
+GH_API_MAX_RETRIES = 3
+
+# Patterns to convert a repository URL to a directory name
+URL_SCHEME_REGEX = re.compile(r"^https?://")
+DIRNAME_UNSAFE_REGEX = re.compile(r"[^a-zA-Z0-9\-_]")
+
+
+def _read_repo_lines(lines) -> list:
+    """Return stripped lines of a repository list, ignoring empty lines and
+    lines starting with #"""
+    return [line for line in (line.strip() for line in lines) if line and not line.startswith("#")]
+
 
 def create_repo_list(repourl, repofile):
     """Compile list of one or multiple repositories depending on given arguments"""
     if repourl:
         return [repourl]
 
-    try:
-        repos = []
-        for line in fileinput.input(repofile):
-            line = line.strip()
-            # Ignore lines starting with #
-            if line and not line.startswith("#"):
-                repos.append(line)
+    # Read from stdin
+    if repofile == "-":
+        return _read_repo_lines(sys.stdin)
 
-        return repos
+    try:
+        with open(repofile, encoding="utf-8") as file:
+            return _read_repo_lines(file)
 
     except FileNotFoundError:
         sys.exit(f"ERROR: File {repofile} not found.")
 
 
+def deduplicate_repo_list(repos: list, cache: bool = False) -> list:
+    """Remove duplicate repositories, keeping their order. If cached, also remove
+    repositories that share a cache directory, e.g. with http and https URLs, as
+    they must not be cloned into it in parallel"""
+    unique_repos: dict = {}
+    for repo in repos:
+        key = url_to_dirname(repo) if cache else repo
+        if key in unique_repos:
+            if repo != unique_repos[key]:
+                logging.warning(
+                    "Skipping repository %s as it is the same as %s", repo, unique_repos[key]
+                )
+            continue
+        unique_repos[key] = repo
+
+    return list(unique_repos.values())
+
+
 def create_filelist(directory: str, *extra_dirs: str) -> list:
     """Create a list of files in the root level of the directory, and a
-    list of relative directory names that shall also be inspected"""
-    filelist = [os.path.join(file) for file in os.listdir(directory)]
-
-    # Go through extra dirs, list their files, and prepend extra dir's name
+    list of first-level directory names that shall also be inspected"""
+    with os.scandir(directory) as entries:
+        root_entries = {entry.name: entry for entry in entries}
+    filelist = list(root_entries)
+
+    # Go through extra dirs, list their files, and prepend extra dir's name.
+    # The directory entries of the first scan already know whether they are a
+    # directory. Symlinks are not followed
     for extra_dir in extra_dirs:
-        extra_dir_path = os.path.join(directory, extra_dir)
-        if os.path.isdir(extra_dir_path):
-            filelist.extend([os.path.join(extra_dir, file) for file in os.listdir(extra_dir_path)])
+        extra_entry = root_entries.get(extra_dir)
+        if extra_entry and extra_entry.is_dir(follow_symlinks=False):
+            with os.scandir(extra_entry.path) as entries:
+                filelist.extend(f"{extra_dir}/{entry.name}" for entry in entries)
 
     return sorted(filelist)
 
 
 def url_to_dirname(url: str) -> str:
     """Shorten and escape a repository URL so it can be used as a directory name"""
-    # Remove http schema
-    url = re.sub(r"^https?://", "", url)
-    # Replace disallowed characters with underscores
-    unix_escaped = re.sub(r"[^a-zA-Z0-9\-_]", "_", url)
-    # Windows has some more limitations
-    win_escaped = re.sub(r'[\\/:*?"<>|]', "_", unix_escaped)
+    # Remove http schema, and replace disallowed characters with underscores.
+    # This also covers the characters that are forbidden on Windows
+    escaped = DIRNAME_UNSAFE_REGEX.sub("_", URL_SCHEME_REGEX.sub("", url))
     # Trim or truncate the name if it's too long (Windows limit: 260 characters)
-    return win_escaped[:260]
+    return escaped[:260]
+
+
+@lru_cache(maxsize=1)
+def _cache_root() -> Path:
+    """Get the base cache directory of this tool. Only resolved once"""
+    return user_cache_path("oss-red-flag-checker")
 
 
 def clean_cache() -> None:
     """Clean the whole cache directory"""
-    cache_dir = user_cache_path("oss-red-flag-checker")
+    cache_dir = _cache_root()
     logging.debug("Attempting to delete %s", cache_dir)
     try:
         rmtree(cache_dir)
@@ -77,11 +129,10 @@ def clean_cache() -> None:
 
 def get_cache_dir(url: str) -> str:
     """Create/get a cache directory for the remote repository"""
-    cachedir = os.path.join(user_cache_path("oss-red-flag-checker"), url_to_dirname(url))
+    cachedir = os.path.join(_cache_root(), url_to_dirname(url))
 
-    if not os.path.isdir(cachedir):
-        logging.info("Creating cache directory: %s", cachedir)
-        os.makedirs(cachedir)
+    logging.info("Using cache directory: %s", cachedir)
+    os.makedirs(cachedir, exist_ok=True)
 
     return cachedir
 
@@ -99,12 +150,12 @@ def clone_or_pull_repository(repo_url: str, local_path: str):
                 local_path,
             )
         try:
-            # fetch origin
-            repo.remotes.origin.fetch()
+            # fetch origin, with the same depth as the initial clone
+            repo.remotes.origin.fetch(depth=100)
             # reset --hard to origin/$branchname, assuming that the user did not
             # change the branch and that the project did not change their main
             # branch
-            repo.git.reset(f"origin/{repo.head.ref}", "--hard")
+            repo.head.reset(commit=f"origin/{repo.head.ref}", index=True, working_tree=True)
         except (GitCommandError, TypeError) as exc:
             logging.error("Fetching and resetting to the newest commits failed: %s", exc)
 
@@ -142,41 +193,38 @@ def shorten_repo_url(url: str) -> str:
     return name
 
 
-def gh_token(token: str) -> Optional[Github]:
+def gh_token(token: str) -> str:
     """Get the GitHub token from argument or environment, while argument
-    overrides"""
+    overrides. The token is checked, and an empty string is returned if there is
+    no valid token"""
     if token:
         pass
     elif "GITHUB_TOKEN" in os.environ and os.environ["GITHUB_TOKEN"]:
         token = os.environ["GITHUB_TOKEN"]
     else:
-        token = ""
         logging.warning(
             "No token for GitHub set. GitHub API limits for unauthorized requests "
             "are very low so you may quickly run into waiting times. "
             "Either use the --token argument or set the GITHUB_TOKEN environment "
             "variable to fix this."
         )
+        return ""
 
     # Log in with token
-    if token:
-        gthb = gh_login(token)
-        try:
-            # Make a test API request
-            _ = gthb.get_user().login
-            # Get current rate information from GitHub, especially the reset time
-            logging.debug("Current rate limit: %s", gthb.get_rate_limit().core)
-        except BadCredentialsException:
-            logging.error(
-                "The provided GitHub token seems to be invalid. Continuing without authentication"
-            )
-            # Return anonymous GitHub object
-            gthb = Github()
+    gthb = gh_login(token)
+    try:
+        # Make a test API request
+        _ = gthb.get_user().login
+        # Get current rate information from GitHub, especially the reset time
+        logging.debug("Current rate limit: %s", gthb.get_rate_limit().core)
+    except BadCredentialsException:
+        logging.error(
+            "The provided GitHub token seems to be invalid. Continuing without authentication"
+        )
+        # Continue anonymously
+        return ""
 
-        return gthb
-
-    # No token provided, return empty Github object
-    return Github()
+    return token
 
 
 def gh_login(token: str = "") -> Github:
@@ -187,6 +235,17 @@ def gh_login(token: str = "") -> Github:
     return Github()
 
 
+def gh_thread_login(token: str = "") -> Github:
+    """Get a Github object for the current thread, created on first use. The
+    requester of a Github object and its connection are not thread-safe, so
+    threads must not share it"""
+    cached = getattr(_GH_THREAD_LOCAL, "github", None)
+    if cached is None or cached[0] != token:
+        _GH_THREAD_LOCAL.github = (token, gh_login(token))
+
+    return _GH_THREAD_LOCAL.github[1]
+
+
 def _gh_handle_ratelimit(gthb: Github, error_msg) -> None:
     """Activated if a rate limit exception occurred. Gets the current rate limit
     and reset time, and waits until then"""
@@ -209,16 +268,117 @@ def _gh_handle_ratelimit(gthb: Github, error_msg) -> None:
     sleep(waitseconds)
 
 
-def gh_api_call(gthb: Github, ghobject, method: str, reverse: bool = False, **kwargs):
+def gh_api_call(gthb: Github, ghobject, method: str, **kwargs):
     """Generic wrapper to make GitHub API calls via PyGithub while catching API
-    limits"""
-    result = None
-    while not result:
+    limits. Retries after waiting for the end of the API limit, but gives up
+    after GH_API_MAX_RETRIES attempts"""
+    for attempt in range(1, GH_API_MAX_RETRIES + 1):
         try:
-            api_result = getattr(ghobject, method)(**kwargs)
-            # Apply reversed order if requested
-            result = api_result.reversed if reverse else api_result
+            with GH_API_SEMAPHORE:
+                return getattr(ghobject, method)(**kwargs)
         except RateLimitExceededException as exc:
+            if attempt == GH_API_MAX_RETRIES:
+                raise
             _gh_handle_ratelimit(gthb, exc)
 
-    return result
+    # Not reachable, but makes clear to linters that there is always a return
+    return None
+
+
+def _gh_requester(gthb: Github):
+    """Get the requester of a Github object which makes the actual HTTP requests.
+    PyGithub does not expose it in all supported versions, but it holds the
+    authentication and base URL of the Github object"""
+    return gthb._Github__requester  # type: ignore # pylint: disable=protected-access
+
+
+def _gh_api_cache_file(url: str, parameters: dict) -> Path:
+    """Get the path of the file in which a GitHub API response is cached"""
+    key = hashlib.sha256(f"{url}?{sorted(parameters.items())}".encode("utf-8")).hexdigest()
+    return _cache_root() / "github_api" / f"{key}.json"
+
+
+def _gh_api_read_cache(cache_file: Path) -> Optional[dict]:
+    """Read a cached GitHub API response consisting of ETag and data"""
+    try:
+        with open(cache_file, encoding="utf-8") as file:
+            cached = json.load(file)
+        if "etag" in cached and "data" in cached:
+            return cached
+    except (FileNotFoundError, ValueError):
+        pass
+
+    return None
+
+
+def _gh_api_write_cache(cache_file: Path, etag: str, data) -> None:
+    """Write a GitHub API response and its ETag to the cache. The file is
+    replaced atomically as multiple repositories may be checked in parallel"""
+    os.makedirs(cache_file.parent, exist_ok=True)
+    tmp_fd, tmp_path = mkstemp(dir=cache_file.parent, suffix=".tmp")
+    with os.fdopen(tmp_fd, "w", encoding="utf-8") as file:
+        json.dump({"etag": etag, "data": data}, file)
+    os.replace(tmp_path, cache_file)
+
+
+def gh_api_get(gthb: Github, url: str, parameters: Optional[dict] = None, cache: bool = False):
+    """Make a raw GET request to the GitHub REST API and return the decoded JSON.
+    This saves the creation of PyGithub objects and their lazy loading if only
+    a few values of the response are needed.
+
+    If cache is True, responses are stored on disk together with their ETag.
+    Subsequent requests are conditional and re-use the stored data if GitHub
+    reports that nothing has changed, which also does not count against the
+    rate limit"""
+    parameters = parameters or {}
+    headers = {}
+
+    cached = None
+    if cache:
+        cache_file = _gh_api_cache_file(url, parameters)
+        if cached := _gh_api_read_cache(cache_file):
+            headers["If-None-Match"] = cached["etag"]
+
+    response_headers, data = gh_api_call(
+        gthb,
+        _gh_requester(gthb),
+        "requestJsonAndCheck",
+        verb="GET",
+        url=url,
+        parameters=parameters,
+        headers=headers,
+    )
+
+    etag = response_headers.get("etag")
+    # 304 Not Modified: no content, and the same ETag as the cached response
+    if cached and data is None and etag == cached["etag"]:
+        logging.debug("GitHub API response for %s has not changed, using cached data", url)
+        return cached["data"]
+
+    if cache:
+        if etag:
+            _gh_api_write_cache(cache_file, etag, data)
+        # Response cannot be validated later, so do not keep an outdated one
+        elif cached:
+            cache_file.unlink(missing_ok=True)
+
+    return data
+
+
+def gh_graphql(gthb: Github, query: str, variables: dict) -> dict:
+    """Send a query to the GitHub GraphQL API and return the requested data.
+    Raises a GithubException if the API returned errors, e.g. if the request is
+    not authenticated which the GraphQL API requires"""
+    _, response = gh_api_call(
+        gthb,
+        _gh_requester(gthb),
+        "requestJsonAndCheck",
+        verb="POST",
+        url="/graphql",
+        input={"query": query, "variables": variables},
+    )
+
+    if not response or response.get("errors"):
+        raise GithubException(200, response, None)
+
+    return response["data"]
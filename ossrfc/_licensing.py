@@ -6,9 +6,17 @@
 
 import logging
 import os
+import re
+from typing import Optional
 
-from ._git import gh_api_call
-from ._matching import find_patterns_in_list, lines_as_list
+from github import GithubException
+
+from ._git import gh_api_get, gh_graphql
+from ._matching import (
+    combine_patterns,
+    find_pattern_in_list,
+    iter_lines,
+)
 from ._report import RepoReport
 
 # Key words for CLA
@@ -26,184 +34,380 @@ DCO_KEYWORDS = [
 ]
 # Key words for inbound=outbound
 INOUTBOUND_KEYWORDS = [r"(?i)inbound[ ]*=[ ]*outbound"]
+# Keyword groups combined into one regex each, so that every string only has
+# to be searched once per group
+CLA_REGEX = combine_patterns(CLA_KEYWORDS)
+DCO_REGEX = combine_patterns(DCO_KEYWORDS)
+INOUTBOUND_REGEX = combine_patterns(INOUTBOUND_KEYWORDS)
+# Names of README and CONTRIBUTING files without extension, also in extra paths
+README_CONTRIBUTING_NAMES = ("readme", "contributing")
+# LICENSE and COPYING files or LICENSES directory
+LICENSE_FILE_REGEX = re.compile(r"^(LICENSE|License|COPYING)")
+# GraphQL query for the newest pull request, optionally against a base branch,
+# and the check runs and statuses of its newest commit
+PULLS_GRAPHQL_QUERY = """
+query($owner: String!, $name: String!, $base: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef { name }
+    pullRequests(
+      first: 1
+      baseRefName: $base
+      states: [OPEN, CLOSED, MERGED]
+      orderBy: { field: UPDATED_AT, direction: DESC }
+    ) {
+      nodes {
+        number
+        baseRefName
+        commits(last: 1) {
+          nodes {
+            commit {
+              oid
+              url
+              statusCheckRollup {
+                contexts(first: 100) {
+                  nodes {
+                    __typename
+                    ... on CheckRun { name title summary url }
+                    ... on StatusContext { context description }
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
 # Additional non-first-level paths that shall be searched in for licensing
 # information
 LICENSEINFO_EXTRA_PATHS = [".github"]
 
 
-def cla_in_files(report: RepoReport):
-    """Search for CLA requirements in README and CONTRIBUTING files"""
-    # Find CONTRIBUTING and README files
-    report.cla_searched_files_ = find_patterns_in_list(
-        [r"(?i)^(|.*\/)(readme|contributing)(\.[a-z]+)?$"], *report.files_
+def _is_readme_or_contributing(path: str) -> bool:
+    """Check whether a file is a README or CONTRIBUTING file, case-insensitive and
+    with an optional extension consisting of letters, e.g. README.md. Plain
+    string operations are faster than a regex for this"""
+    name, dot, extension = path.rsplit("/", 1)[-1].lower().partition(".")
+    if name not in README_CONTRIBUTING_NAMES:
+        return False
+    # No extension at all, or one without digits, symbols or further dots
+    return not dot or (extension.isascii() and extension.isalpha())
+
+
+def find_license_candidate_files(report: RepoReport) -> None:
+    """Find README and CONTRIBUTING files that may contain licensing
+    information. Must run before the files are scanned"""
+    report.license_candidate_files_ = sorted(
+        file for file in report.files_ if _is_readme_or_contributing(file)
     )
 
-    for file in report.cla_searched_files_:
-        file_path = os.path.join(report.repodir_, file)
-        file_lines = lines_as_list(file_path)
 
-        if cla_matches := find_patterns_in_list(CLA_KEYWORDS, *file_lines):
-            report.cla_files.append(
-                {
-                    "file": file,
-                    "indicators": cla_matches,
-                }
-            )
+def scan_license_files(
+    report: RepoReport, cla: bool = False, dco: bool = False, inbound_outbound: bool = False
+) -> None:
+    """Search for CLA and DCO requirements and inbound=outbound rules in README
+    and CONTRIBUTING files. Each file is only read once for all enabled searches"""
+    # CONTRIBUTING and README files, see find_license_candidate_files()
+    searched_files = report.license_candidate_files_
+
+    # Collect the search method of the keyword regex and the list of findings in
+    # the report for enabled searches
+    searches = []
+    if cla:
+        report.cla_searched_files_ = searched_files
+        searches.append((CLA_REGEX.search, report.cla_files))
+    if dco:
+        report.dco_searched_files_ = searched_files
+        searches.append((DCO_REGEX.search, report.dco_files))
+    if inbound_outbound:
+        report.inoutbound_searched_files_ = searched_files
+        searches.append((INOUTBOUND_REGEX.search, report.inoutbound_files))
+
+    if not searches:
+        return
+
+    # Resolve the repository directory and the join function only once. Keep
+    # os.path.join as the checker also runs on Windows
+    base, join = report.repodir_, os.path.join
+    for file in searched_files:
+        file_path = join(base, file)
+        # Matching lines for each search
+        file_matches: list = [[] for _ in searches]
+
+        for line in iter_lines(file_path):
+            if not line:
+                continue
+            # One search per keyword group and line. The combined regex
+            # already covers literal keywords efficiently
+            for (search, _), matches in zip(searches, file_matches):
+                if search(line):
+                    matches.append(line)
+
+        for (_, findings), matches in zip(searches, file_matches):
+            if matches:
+                findings.append(
+                    {
+                        "file": file,
+                        "indicators": sorted(matches),
+                    }
+                )
 
 
-def dco_in_files(report: RepoReport):
-    """Search for DCO requirements in README and CONTRIBUTING files"""
-    # Find CONTRIBUTING and README files
-    report.dco_searched_files_ = find_patterns_in_list(
-        [r"(?i)^(|.*\/)(readme|contributing)(\.[a-z]+)?$"], *report.files_
-    )
+def cla_in_files(report: RepoReport):
+    """Search for CLA requirements in README and CONTRIBUTING files"""
+    scan_license_files(report, cla=True)
 
-    for file in report.dco_searched_files_:
-        file_path = os.path.join(report.repodir_, file)
-        file_lines = lines_as_list(file_path)
 
-        if dco_matches := find_patterns_in_list(DCO_KEYWORDS, *file_lines):
-            report.dco_files.append(
-                {
-                    "file": file,
-                    "indicators": dco_matches,
-                }
-            )
+def dco_in_files(report: RepoReport):
+    """Search for DCO requirements in README and CONTRIBUTING files"""
+    scan_license_files(report, dco=True)
 
 
-def _cla_or_dco_in_checks(report, check_runs, newest_pull):
+def _cla_or_dco_in_checks(report, check_runs: list, pull_number: int):
     """Part of cla_or_dco_in_pulls(), checking action runs pull requests"""
+    # Only compile debug messages if they are actually logged
+    log = logging.getLogger()
+    debug = log.isEnabledFor(logging.DEBUG)
     for check in check_runs:
-        logging.debug("Checking check-run %s", check.html_url)
+        if debug:
+            log.debug("Checking check-run %s", check["url"])
         # If we have a CLA match, add to report
-        if cla_matches := find_patterns_in_list(
-            CLA_KEYWORDS, check.name, check.output.title, check.output.summary
+        if cla_matches := find_pattern_in_list(
+            CLA_REGEX, check["name"], check["title"], check["summary"]
         ):
             report.cla_pulls.append(
                 {
-                    "pull_request": newest_pull.number,
+                    "pull_request": pull_number,
                     "type": "action",
-                    "url": check.html_url,
+                    "url": check["url"],
                     "indicators": cla_matches,
                 }
             )
 
         # If we have a DCO match, add to report
-        if dco_matches := find_patterns_in_list(
-            DCO_KEYWORDS, check.name, check.output.title, check.output.summary
+        if dco_matches := find_pattern_in_list(
+            DCO_REGEX, check["name"], check["title"], check["summary"]
         ):
             report.dco_pulls.append(
                 {
-                    "pull_request": newest_pull.number,
+                    "pull_request": pull_number,
                     "type": "action",
-                    "url": check.html_url,
+                    "url": check["url"],
                     "indicators": dco_matches,
                 }
             )
 
 
-def _cla_or_dco_in_statuses(report, statuses, newest_pull):
+def _cla_or_dco_in_statuses(report, statuses: list, pull_number: int):
     """Part of cla_or_dco_in_pulls(), checking statuses in pull requests"""
+    # Only compile debug messages if they are actually logged
+    log = logging.getLogger()
+    debug = log.isEnabledFor(logging.DEBUG)
     for status in statuses:
-        logging.debug("Checking status %s", status.url)
+        if debug:
+            log.debug("Checking status %s", status["url"])
         # If we have a CLA match, add to report
-        if cla_matches := find_patterns_in_list(CLA_KEYWORDS, status.description, status.context):
+        if cla_matches := find_pattern_in_list(CLA_REGEX, status["description"], status["context"]):
             report.cla_pulls.append(
                 {
-                    "pull_request": newest_pull.number,
+                    "pull_request": pull_number,
                     "type": "status",
-                    "url": status.url,
+                    "url": status["url"],
                     "indicators": cla_matches,
                 }
             )
 
         # If we have a DCO match, add to report
-        if dco_matches := find_patterns_in_list(DCO_KEYWORDS, status.description, status.context):
+        if dco_matches := find_pattern_in_list(DCO_REGEX, status["description"], status["context"]):
             report.dco_pulls.append(
                 {
-                    "pull_request": newest_pull.number,
+                    "pull_request": pull_number,
                     "type": "status",
-                    "url": status.url,
+                    "url": status["url"],
                     "indicators": dco_matches,
                 }
             )
 
 
-def cla_or_dco_in_pulls(report: RepoReport) -> None:
-    """Search for CLA or DCO requirements in Pull Requests"""
+def _newest_pull_graphql(report: RepoReport) -> Optional[dict]:
+    """Part of cla_or_dco_in_pulls(), getting the newest pull request with the
+    check runs and statuses of its newest commit via the GraphQL API. Usually,
+    this only takes a single request"""
+    owner, name = report.shortname.split("/", 1)
+
+    # Get newest Pull Request. If it's not against the default branch, try to
+    # find the newest Pull Request against the default branch as we assume that
+    # CLA checks will definitely be activated for PRs against it
+    repo = gh_graphql(report.github_, PULLS_GRAPHQL_QUERY, {"owner": owner, "name": name})[
+        "repository"
+    ]
+    if not repo["pullRequests"]["nodes"]:
+        return None
+    newest_pull = repo["pullRequests"]["nodes"][0]
+
+    basebranch = (repo["defaultBranchRef"] or {}).get("name")
+    if basebranch and newest_pull["baseRefName"] != basebranch:
+        logging.debug(
+            "Newest pull request is not against base '%s'. Searching for one against it...",
+            basebranch,
+        )
+        base_pulls = gh_graphql(
+            report.github_,
+            PULLS_GRAPHQL_QUERY,
+            {"owner": owner, "name": name, "base": basebranch},
+        )["repository"]["pullRequests"]["nodes"]
+        if base_pulls:
+            newest_pull = base_pulls[0]
+
+    pull = {"number": newest_pull["number"], "check_runs": [], "statuses": []}
+
+    # Get newest commit from newest PR
+    if not newest_pull["commits"]["nodes"]:
+        return pull
+    newest_commit = newest_pull["commits"]["nodes"][0]["commit"]
 
-    repo = gh_api_call(report.github_, report.github_, "get_repo", full_name_or_id=report.shortname)
+    logging.debug("Checking commit %s", newest_commit["url"])
+
+    # Split the check runs (actions) and statuses of this commit
+    contexts = (newest_commit["statusCheckRollup"] or {}).get("contexts", {}).get("nodes", [])
+    for context in contexts:
+        if context["__typename"] == "CheckRun":
+            pull["check_runs"].append(
+                {
+                    "name": context["name"],
+                    "title": context["title"],
+                    "summary": context["summary"],
+                    "url": context["url"],
+                }
+            )
+        elif context["__typename"] == "StatusContext":
+            pull["statuses"].append(
+                {
+                    "description": context["description"],
+                    "context": context["context"],
+                    # Same URL as returned by the REST API
+                    "url": (
+                        f"https://api.github.com/repos/{report.shortname}/statuses/"
+                        f"{newest_commit['oid']}"
+                    ),
+                }
+            )
+
+    return pull
+
+
+def _newest_pull_rest(report: RepoReport) -> Optional[dict]:
+    """Part of cla_or_dco_in_pulls(), getting the newest pull request with the
+    check runs and statuses of its newest commit via the REST API. If caching is
+    enabled, all requests are conditional and re-use unchanged responses"""
+    repo_url = f"/repos/{report.shortname}"
+    repo = gh_api_get(report.github_, repo_url, cache=report.cache_)
 
     # Get newest Pull Request against default branch as we assume that CLA
     # checks will definitely be activated for PRs against it
-    basebranch = repo.default_branch
-    try:
-        newest_pull = gh_api_call(
-            report.github_,
-            repo,
-            "get_pulls",
-            sort="updated",
-            state="all",
-            direction="desc",
-            base=basebranch,
-        )[0]
+    basebranch = repo["default_branch"]
+    pulls_parameters = {"sort": "updated", "state": "all", "direction": "desc", "per_page": 1}
+    pulls = gh_api_get(
+        report.github_,
+        f"{repo_url}/pulls",
+        parameters={**pulls_parameters, "base": basebranch},
+        cache=report.cache_,
+    )
 
     # List of pull requests is empty. We try it without the base branch first
-    except IndexError:
+    if not pulls:
         logging.debug(
             "Searching for pull request against base '%s' failed. Trying without base...",
             basebranch,
         )
-        try:
-            newest_pull = gh_api_call(
-                report.github_, repo, "get_pulls", sort="updated", state="all", direction="desc"
-            )[0]
+        pulls = gh_api_get(
+            report.github_, f"{repo_url}/pulls", parameters=pulls_parameters, cache=report.cache_
+        )
 
-        # Still no pull request returned. We assume there is no PR at all and
-        # stop the function
-        except IndexError:
-            logging.warning("Searching for pull requests failed, probably because there are none")
-            return
+        # Still no pull request returned. We assume there is no PR at all
+        if not pulls:
+            return None
+    newest_pull = pulls[0]
+
+    # The head of the newest PR is its newest commit
+    commit_sha = newest_pull["head"]["sha"]
+    logging.debug("Checking commit %s/commit/%s", newest_pull["html_url"], commit_sha)
+
+    # Get check runs (actions) and statuses for this commit
+    check_runs = gh_api_get(
+        report.github_,
+        f"{repo_url}/commits/{commit_sha}/check-runs",
+        parameters={"per_page": 100},
+        cache=report.cache_,
+    )
+    statuses = gh_api_get(
+        report.github_,
+        f"{repo_url}/commits/{commit_sha}/statuses",
+        parameters={"per_page": 100},
+        cache=report.cache_,
+    )
 
-    logging.debug("Checking Pull Request #%s", newest_pull.number)
+    return {
+        "number": newest_pull["number"],
+        "check_runs": [
+            {
+                "name": check["name"],
+                "title": check["output"]["title"],
+                "summary": check["output"]["summary"],
+                "url": check["html_url"],
+            }
+            for check in (check_runs or {}).get("check_runs", [])
+        ],
+        "statuses": [
+            {
+                "description": status["description"],
+                "context": status["context"],
+                "url": status["url"],
+            }
+            for status in statuses or []
+        ],
+    }
 
-    # Get newest commit from newest PR
-    newest_commit = gh_api_call(report.github_, newest_pull, "get_commits", reverse=True)[0]
 
-    logging.debug("Checking commit %s", newest_commit.html_url)
+def cla_or_dco_in_pulls(report: RepoReport) -> None:
+    """Search for CLA or DCO requirements in Pull Requests"""
+
+    # The GraphQL API returns everything we need in one request, but requires
+    # authentication. Otherwise, or if it fails, use multiple REST API requests
+    if report.github_authenticated_:
+        try:
+            newest_pull = _newest_pull_graphql(report)
+        except GithubException as exc:
+            logging.debug("GraphQL API request failed, falling back to REST API: %s", exc)
+            newest_pull = _newest_pull_rest(report)
+    else:
+        newest_pull = _newest_pull_rest(report)
+
+    # No pull request returned. We assume there is no PR at all and stop the
+    # function
+    if newest_pull is None:
+        logging.warning("Searching for pull requests failed, probably because there are none")
+        return
+
+    logging.debug("Checking Pull Request #%s", newest_pull["number"])
 
     # Go through all checks runs (actions) for this commit, search for CLA and
     # DCO indicators
-    check_runs = gh_api_call(report.github_, newest_commit, "get_check_runs")
-    _cla_or_dco_in_checks(report, check_runs, newest_pull)
+    _cla_or_dco_in_checks(report, newest_pull["check_runs"], newest_pull["number"])
 
     # Go through all statuses runs for this commit, search for CLA and DCO indicators
-    statuses = gh_api_call(report.github_, newest_commit, "get_statuses")
-    _cla_or_dco_in_statuses(report, statuses, newest_pull)
+    _cla_or_dco_in_statuses(report, newest_pull["statuses"], newest_pull["number"])
 
 
 def inoutbound(report: RepoReport):
     """Search for inbound=outbound rules in README and CONTRIBUTING files"""
-    # Find CONTRIBUTING and README files
-    report.inoutbound_searched_files_ = find_patterns_in_list(
-        [r"(?i)^(|.*\/)(readme|contributing)(\.[a-z]+)?$"], *report.files_
-    )
-
-    for file in report.inoutbound_searched_files_:
-        file_path = os.path.join(report.repodir_, file)
-        file_lines = lines_as_list(file_path)
-
-        if inoutbound_matches := find_patterns_in_list(INOUTBOUND_KEYWORDS, *file_lines):
-            report.inoutbound_files.append(
-                {
-                    "file": file,
-                    "indicators": inoutbound_matches,
-                }
-            )
+    scan_license_files(report, inbound_outbound=True)
 
 
 def licensefile(report: RepoReport):
     """Search for a LICENSE/COPYING file. Also includes LICENSES directory
     according to REUSE. If absent, it's a red flag"""
     # Find CONTRIBUTING and README files or LICENSES directory
-    report.licensefiles = find_patterns_in_list([r"^(LICENSE|License|COPYING)"], *report.files_)
+    report.licensefiles = find_pattern_in_list(LICENSE_FILE_REGEX, *report.files_)
@@ -5,26 +5,61 @@
 """Functions for matching things in things"""
 
 import re
+from functools import lru_cache
+from typing import Iterator, Union
+
+# Global inline flags at the start of a regex, e.g. (?i)
+GLOBAL_FLAGS_REGEX = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: Union[str, re.Pattern]) -> re.Pattern:
+    """Compile a pattern only once. Already compiled patterns are returned as-is"""
+    return re.compile(pattern)
 
 
 def find_patterns_in_list(patternlist: list, *fields: str):
     """Search for a list of patterns in one or multiple strings. The patterns
-    can be regexes"""
-    # Add relevant fields in which indicators may be hidden
-    validfields = []
-    for field in fields:
-        if field:
-            validfields.append(field)
+    can be regexes, either as strings or pre-compiled"""
+    # Nothing to search for or in
+    if not patternlist or not any(fields):
+        return []
+
+    # Search methods of the compiled patterns, resolved once for all fields
+    searchers = tuple(_compile(pattern).search for pattern in patternlist)
+
+    # Search for indicators in relevant (non-empty) fields using regex
+    return sorted(field for field in fields if field and any(search(field) for search in searchers))
+
 
-    # Search for indicators in relevant fields using regex
-    matches = [
-        match for match in validfields if any(re.search(pattern, match) for pattern in patternlist)
-    ]
+def combine_patterns(patternlist: list) -> re.Pattern:
+    """Combine a list of regex patterns into a single pattern with alternations,
+    so that a string has to be searched only once. Global inline flags at the
+    start of a pattern, e.g. (?i), only apply to this pattern's alternation"""
+    alternations = []
+    for pattern in patternlist:
+        if flags := GLOBAL_FLAGS_REGEX.match(pattern):
+            alternations.append(f"(?{flags.group(1)}:{pattern[flags.end():]})")
+        else:
+            alternations.append(f"(?:{pattern})")
 
-    return sorted(matches)
+    return re.compile("|".join(alternations))
+
+
+def find_pattern_in_list(pattern: Union[str, re.Pattern], *fields: str) -> list:
+    """Search for a single pattern in one or multiple strings. The pattern can be
+    a regex, either as string or pre-compiled"""
+    search = _compile(pattern).search
+    return sorted(field for field in fields if field and search(field))
+
+
+def iter_lines(filepath) -> Iterator[str]:
+    """Yield the lines of a file one by one, without trailing whitespace"""
+    with open(filepath, encoding="utf-8") as file:
+        for line in file:
+            yield line.rstrip()
 
 
 def lines_as_list(filepath) -> list:
     """Return all lines of a file as list of lines"""
-    with open(filepath, encoding="utf-8") as file:
-        return [line.rstrip() for line in file]
+    return list(iter_lines(filepath))
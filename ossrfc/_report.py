@@ -5,8 +5,8 @@
 """Dataclass holding the analysis of a repository and functions to display it"""
 
 import json
-from dataclasses import asdict, dataclass, field
-from io import StringIO
+import sys
+from dataclasses import dataclass, field, fields
 
 from github import Github
 from termcolor import colored
@@ -14,8 +14,15 @@ from termcolor import colored
 # Version of the returned JSON in case there will be breaking changes
 JSON_VERSION = "1.0"
 
+# Severities of findings and their icons, in the order they are printed
+_SEVERITY = (("red", "🚩"), ("yellow", "⚠️"), ("green", "✔"))
 
-@dataclass
+# Store report attributes in slots instead of a per-instance __dict__. Only
+# supported by dataclasses as of Python 3.10
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class RepoReport:  # pylint: disable=too-many-instance-attributes
     """Data class that holds a report about a repository"""
 
@@ -27,11 +34,14 @@ class RepoReport:  # pylint: disable=too-many-instance-attributes
     repodir_: str = ""
     impossible_checks_: list = field(default_factory=list)
     github_: Github = Github()
+    github_authenticated_: bool = False
+    cache_: bool = False
     files_: list = field(default_factory=list)
+    license_candidate_files_: list = field(default_factory=list)
     red_flags: list = field(default_factory=list)
     yellow_flags: list = field(default_factory=list)
     green_flags: list = field(default_factory=list)
-    ignorelist_: list = field(default_factory=list)
+    ignorelist_: frozenset = frozenset()
     cla_searched_files_: list = field(default_factory=list)
     cla_files: list = field(default_factory=list)
     cla_pulls: list = field(default_factory=list)
@@ -50,22 +60,27 @@ class RepoReport:  # pylint: disable=too-many-instance-attributes
     analysis: list = field(default_factory=list)
 
 
-def _dictify_report(report: RepoReport) -> dict:
+def _dictify_report(report: RepoReport, include_private: bool = False) -> dict:
     """Removes temporary/technical keys/attributes and returns a dictionary of
-    the report, based on the dataclass"""
-    return asdict(report)
+    the report, based on the dataclass. Technical attributes (ending with an
+    underscore) are only kept if requested, the github_ object never. Other than
+    dataclasses.asdict(), values are not deep-copied"""
+    report_dict = {
+        attr.name: getattr(report, attr.name)
+        for attr in fields(report)
+        if (include_private or not attr.name.endswith("_")) and attr.name != "github_"
+    }
+    # Sets are not JSON serializable, so provide the ignorelist as sorted list
+    if "ignorelist_" in report_dict:
+        report_dict["ignorelist_"] = sorted(report_dict["ignorelist_"])
 
+    return report_dict
 
-def _listdict_reports(report: RepoReport) -> list:
-    """Make a single or RepoReports a list of dicts"""
-    if isinstance(report, list):
-        report_list = []
-        for single_report in report:
-            report_list.append(_dictify_report(single_report))
-    else:
-        report_list = [_dictify_report(report)]
 
-    return report_list
+def _listdict_reports(report: RepoReport, include_private: bool = False) -> list:
+    """Make a single or RepoReports a list of dicts"""
+    reports = report if isinstance(report, list) else [report]
+    return [_dictify_report(single_report, include_private) for single_report in reports]
 
 
 def _dict_skeleton() -> dict:
@@ -86,72 +101,52 @@ def print_json_report(report: RepoReport, disabled_checks: list, debug: bool, ig
     report_dict["disabled_checks"] = disabled_checks
     report_dict["ignored_flags"] = ignore
     report_dict["debug_mode"] = debug
-    report_dict["repositories"] = _listdict_reports(report)
-
-    # Collect keys that end with an underscore which we consider to be temporary
-    # attributes. If not in DEBUG mode, remove them from the dict
-    for repo_report in report_dict["repositories"]:
-        if not debug:
-            removed_keys = []
-            for key in repo_report.keys():
-                if key.endswith("_"):
-                    removed_keys.append(key)
-
-            # Actually remove keys
-            for key in removed_keys:
-                repo_report.pop(key)
-        # Even in Debug mode, delete github_ object
-        else:
-            repo_report.pop("github_")
+    # Keys that end with an underscore are considered to be temporary
+    # attributes. They are only kept in DEBUG mode
+    report_dict["repositories"] = _listdict_reports(report, debug)
 
     print(json.dumps(report_dict, indent=2, ensure_ascii=False))
 
 
-def print_text_analysis(report_list: list):  # noqa: C901
+def print_text_analysis(report_list: list):
     """Print a plain text analysis of the findings"""
 
     result = []
     # Go through each report separately
     for report in report_list:
-        redflag = []
-        yellowflag = []
-        greenflag = []
+        flags: dict = {severity: [] for severity, _ in _SEVERITY}
         ignored = 0
-        # Look at each analysed finding, check if it's ignored, and compile text
+        # Look at each analysed finding, check if it's ignored, and sort it by
+        # severity
         for finding in report.analysis:
             if finding["ignored"]:
                 ignored += 1
-            else:
-                if finding["severity"] == "red":
-                    icon, category, indicator = "🚩", finding["category"], finding["indicator"]
-                    redflag.append(f"{icon} {category}: {indicator}")
-                if finding["severity"] == "yellow":
-                    icon, category, indicator = "⚠️", finding["category"], finding["indicator"]
-                    yellowflag.append(f"{icon} {category}: {indicator}")
-                if finding["severity"] == "green":
-                    icon, category, indicator = "✔", finding["category"], finding["indicator"]
-                    greenflag.append(f"{icon} {category}: {indicator}")
-
-        # Print text nicely if there was any finding
-        out = StringIO()
+            elif finding["severity"] in flags:
+                flags[finding["severity"]].append(finding)
+
+        # Compile text nicely if there was any finding
+        parts = []
         if report.analysis:
             # Headline for report
-            out.write(colored(f"# Report for {report.shortname} ({report.url})\n", attrs=["bold"]))
+            parts.append(
+                colored(f"# Report for {report.shortname} ({report.url})\n", attrs=["bold"])
+            )
 
             # Print findings in order of severity
-            for msg in redflag + yellowflag + greenflag:
-                out.write(f"\n* {msg}")
+            for severity, icon in _SEVERITY:
+                for finding in flags[severity]:
+                    parts.append(f"\n* {icon} {finding['category']}: {finding['indicator']}")
 
             # Print ignored finding count, if any
             if ignored:
-                out.write(f"\n* 💡 There were {ignored} finding(s) that you explicitely ignored")
+                parts.append(f"\n* 💡 There were {ignored} finding(s) that you explicitely ignored")
 
         if report.impossible_checks_:
-            out.write(
+            parts.append(
                 "\n* 💡 The follow checks could not be executed: "
                 f"{', '.join(report.impossible_checks_)}"
             )
 
-        result.append(out.getvalue())
+        result.append("".join(parts))
 
     print("\n\n".join(result))
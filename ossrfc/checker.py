@@ -10,8 +10,8 @@ import argparse
 import logging
 import sys
 import tempfile
-
-from github import Github
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from . import __version__
 from ._analysis import analyse_report
@@ -21,17 +21,18 @@ from ._git import (
     clone_or_pull_repository,
     create_filelist,
     create_repo_list,
+    deduplicate_repo_list,
     get_cache_dir,
+    gh_thread_login,
     gh_token,
     shorten_repo_url,
 )
 from ._licensing import (
     LICENSEINFO_EXTRA_PATHS,
-    cla_in_files,
     cla_or_dco_in_pulls,
-    dco_in_files,
-    inoutbound,
+    find_license_candidate_files,
     licensefile,
+    scan_license_files,
 )
 from ._report import RepoReport, print_json_report, print_text_analysis
 
@@ -81,7 +82,17 @@ parser.add_argument(
     "-c",
     "--cache",
     action="store_true",
-    help="Cache cloned remote repositories to speed up subsequent checks",
+    help=(
+        "Cache cloned remote repositories and GitHub API responses to speed up "
+        "subsequent checks. Cached API responses are re-used if GitHub reports "
+        "them as unchanged"
+    ),
+)
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=8,
+    help="Number of repositories to check in parallel. Default: 8",
 )
 parser.add_argument(
     "-t",
@@ -118,7 +129,12 @@ parser.add_argument(
 )
 # Maintenance "commands"
 parser_repos.add_argument(
-    "--cache-clean", action="store_true", help="Maintenance: Clean the cache directory, then exit"
+    "--cache-clean",
+    action="store_true",
+    help=(
+        "Maintenance: Clean the cache directory, including cached repositories "
+        "and GitHub API responses, then exit"
+    ),
 )
 parser_repos.add_argument(
     "--version", action="store_true", help="Show the version of ossrfc, then exit"
@@ -153,7 +169,7 @@ def check_enabled(disabled_checks: list, check_name: str) -> bool:
     return True
 
 
-def check_repo(repo: str, gthb: Github, disable: list, cache: bool) -> RepoReport:  # noqa: C901
+def check_repo(repo: str, token: str, disable: list, cache: bool) -> RepoReport:  # noqa: C901
     """Run all checks on a single repository and return a report"""
     # Initialise the report dataclass
     report = RepoReport()
@@ -164,6 +180,7 @@ def check_repo(repo: str, gthb: Github, disable: list, cache: bool) -> RepoRepor
     logging.info("Checking repository %s", report.url)
 
     # Clone repo, depending on cache status
+    report.cache_ = cache
     if cache:
         report.repodir_ = get_cache_dir(report.url)
     else:
@@ -175,11 +192,14 @@ def check_repo(repo: str, gthb: Github, disable: list, cache: bool) -> RepoRepor
     # List all first-level files of the repository and relevant extra paths
     # for CLAs
     report.files_ = create_filelist(report.repodir_, *LICENSEINFO_EXTRA_PATHS)
+    # Find README and CONTRIBUTING files that are searched by multiple checks
+    find_license_candidate_files(report)
 
     # Checks that can only run if repo is on github.com
     if "github.com" in report.url:
-        # Populate Github object
-        report.github_ = gthb
+        # Populate Github object of this thread
+        report.github_ = gh_thread_login(token)
+        report.github_authenticated_ = bool(token)
 
         # CLA/DCO: Search in Pull Request actions and statuses
         if check_enabled(disable, "cla-dco-pulls"):
@@ -196,16 +216,14 @@ def check_repo(repo: str, gthb: Github, disable: list, cache: bool) -> RepoRepor
             report.url,
         )
 
-    # CLA: Search in in README and CONTRIBUTING files
-    if check_enabled(disable, "cla-files"):
-        cla_in_files(report)
-    # DCO: Search in in README and CONTRIBUTING files
-    if check_enabled(disable, "dco-files"):
-        dco_in_files(report)
-
-    # inbound=outbound: Search in in README and CONTRIBUTING files
-    if check_enabled(disable, "inbound-outbound"):
-        inoutbound(report)
+    # CLA, DCO and inbound=outbound: Search in README and CONTRIBUTING files.
+    # All enabled searches are done in a single pass over the files
+    scan_license_files(
+        report,
+        cla=check_enabled(disable, "cla-files"),
+        dco=check_enabled(disable, "dco-files"),
+        inbound_outbound=check_enabled(disable, "inbound-outbound"),
+    )
 
     # licensefile: Search for LICENSE/COPYING files
     if check_enabled(disable, "licensefile"):
@@ -239,20 +257,27 @@ def main():
     if any([args.cache_clean, args.version]):
         sys.exit(0)
 
-    repos = create_repo_list(args.repourl, args.repofile)
-
-    # Get GitHub token from argument or environment, create GitHub object
-    gthb = gh_token(args.token)
+    # Remove duplicate repositories. Otherwise, they would be cloned into the
+    # same cache directory in parallel
+    repos = deduplicate_repo_list(create_repo_list(args.repourl, args.repofile), args.cache)
+
+    # Get GitHub token from argument or environment
+    token = gh_token(args.token)
+
+    # Search for indicators in all repositories. This is mostly waiting for
+    # network and disk I/O, so check multiple repositories in parallel. Each
+    # thread uses its own GitHub object. The reports keep the order of the
+    # given repositories
+    with ThreadPoolExecutor(max_workers=max(1, min(args.jobs, len(repos)))) as executor:
+        report_list = list(
+            executor.map(
+                partial(check_repo, token=token, disable=args.disable, cache=args.cache), repos
+            )
+        )
 
-    # Loop checks for each repository
-    report_list = []
-    for repo in repos:
-        # Search for indicators in the repository
-        report = check_repo(repo, gthb, args.disable, args.cache)
-        # Analyse and evaluate the findings
+    # Analyse and evaluate the findings
+    for report in report_list:
         analyse_report(report, args.ignore)
-        # Add full report to report list
-        report_list.append(report)
 
     if args.json or args.debug:
         print_json_report(report_list, args.disable, args.debug, args.ignore)
@@ -11,21 +11,60 @@ from pathlib import Path
 import pytest
 
 from ossrfc._git import create_filelist, shorten_repo_url
-from ossrfc._licensing import CLA_KEYWORDS
+from ossrfc._licensing import CLA_KEYWORDS, find_license_candidate_files
 from ossrfc._report import RepoReport
 
 TESTS_DIRECTORY = Path(__file__).parent.resolve()
 RESOURCES_DIRECTORY = TESTS_DIRECTORY / "resources"
 
 
+class FakeRequester:  # pylint: disable=too-few-public-methods
+    """Fake PyGithub requester. Responses are looked up by URL and can be data,
+    an exception to raise, or a function that gets the request parameters or
+    input. If an ETag is set, conditional requests are supported"""
+
+    def __init__(self, responses: dict, etag: str = ""):
+        self.responses = responses
+        self.etag = etag
+        self.requests: list = []
+
+    def requestJsonAndCheck(
+        self, verb, url, parameters=None, headers=None, input=None
+    ):  # pylint: disable=invalid-name,redefined-builtin,too-many-arguments
+        """Fake request, returns no content if the ETag has not changed"""
+        self.requests.append(
+            {"verb": verb, "url": url, "parameters": parameters, "headers": headers, "input": input}
+        )
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        if callable(response):
+            response = response(input if input is not None else parameters)
+
+        if not self.etag:
+            return {}, response
+        if headers and headers.get("If-None-Match") == self.etag:
+            return {"etag": self.etag}, None
+        return {"etag": self.etag}, response
+
+
+class FakeGithub:  # pylint: disable=too-few-public-methods
+    """Fake Github object holding a requester"""
+
+    def __init__(self, requester: FakeRequester):
+        self.requester = requester
+        self._Github__requester = requester  # pylint: disable=invalid-name
+
+
 def _create_fake_repository(tmpdir_factory) -> Path:
     """Create a temporary fake repository."""
     directory = Path(str(tmpdir_factory.mktemp("fake_repository")))
-    for file_ in (RESOURCES_DIRECTORY / "fake_repository").iterdir():
-        if file_.is_file():
-            shutil.copy(file_, directory / file_.name)
-        elif file_.is_dir():
-            shutil.copytree(file_, directory / file_.name)
+    with os.scandir(RESOURCES_DIRECTORY / "fake_repository") as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                shutil.copy(entry.path, directory / entry.name)
+            elif entry.is_dir(follow_symlinks=False):
+                shutil.copytree(entry.path, directory / entry.name)
 
     # Get rid of those pesky pyc files.
     shutil.rmtree(directory / "src/__pycache__", ignore_errors=True)
@@ -34,25 +73,38 @@ def _create_fake_repository(tmpdir_factory) -> Path:
     return directory
 
 
-@pytest.fixture()
-def fake_repository(tmpdir_factory):
-    """Return a fake repository directory"""
+@pytest.fixture(scope="session", name="fake_repository")
+def fixture_fake_repository(tmpdir_factory):
+    """Return a fake repository directory. It is shared by all tests, so they
+    must not modify it"""
     return _create_fake_repository(tmpdir_factory)
 
 
 @pytest.fixture()
-def fake_report(tmpdir_factory) -> RepoReport:
+def fake_report(fake_repository) -> RepoReport:
     """Create a temporary empty RepoReport"""
     report = RepoReport()
 
     report.url = "https://github.com/dbsystel/playground"
     report.shortname = shorten_repo_url(report.url)
-    report.repodir_ = str(_create_fake_repository(tmpdir_factory))
+    report.repodir_ = str(fake_repository)
     report.files_ = create_filelist(report.repodir_)
+    find_license_candidate_files(report)
 
     return report
 
 
+@pytest.fixture
+def fake_github():
+    """Return a function creating a fake Github object whose requester returns
+    the given responses"""
+
+    def _fake_github(responses: dict, etag: str = "") -> FakeGithub:
+        return FakeGithub(FakeRequester(responses, etag))
+
+    return _fake_github
+
+
 @pytest.fixture
 def cla_keywords():
     """CLA_KEYWORDS"""
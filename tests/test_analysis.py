@@ -0,0 +1,25 @@
+# SPDX-FileCopyrightText: 2023 DB Systel GmbH
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for _analysis.py"""
+
+from ossrfc._analysis import analyse_report
+from ossrfc._report import RepoReport
+
+
+def test_analyse_report_unique_flags(fake_report: RepoReport):
+    """Flags found by multiple checks are only listed once"""
+    fake_report.cla_files = [{"file": "README.md", "indicators": ["Sign our CLA"]}]
+    fake_report.cla_pulls = [{"pull_request": 1, "type": "status", "indicators": ["cla-bot"]}]
+    fake_report.dco_files = [{"file": "README.md", "indicators": ["Signed-off-by"]}]
+    fake_report.dco_pulls = [{"pull_request": 1, "type": "action", "indicators": ["DCO"]}]
+    fake_report.licensefiles = ["LICENSE"]
+
+    analyse_report(fake_report, ["cla"])
+
+    assert fake_report.red_flags == ["cla"]
+    assert fake_report.green_flags == ["dco"]
+    # Both findings are still analysed
+    assert len(fake_report.analysis) == 4
+    assert all(finding["ignored"] for finding in fake_report.analysis[:2])
@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2023 DB Systel GmbH
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for _contributions.py"""
+
+import shutil
+import subprocess
+
+import pytest
+from git import Actor, Repo
+
+from ossrfc import _contributions
+from ossrfc._contributions import _is_bot, maintainer_dominance, old_commits
+from ossrfc._report import RepoReport
+
+
+def test_is_bot():
+    """Check whether a user name indicates a bot"""
+    assert _is_bot("renovate[bot]")
+    assert _is_bot("Dependabot")
+    assert _is_bot("weblate")
+    assert not _is_bot("Weblate Admin")
+    assert not _is_bot("The renovate fan")
+    assert not _is_bot("")
+
+
+def test_maintainer_dominance(fake_report: RepoReport, fake_github):
+    """Rate the dominance of the main contributor, ignoring bots"""
+    contributors = [
+        {"login": "alice", "type": "User", "contributions": 100},
+        {"login": "dependabot[bot]", "type": "Bot", "contributions": 50},
+        {"login": "renovate-helper", "type": "User", "contributions": 40},
+    ] + [{"login": f"dev{i}", "type": "User", "contributions": 2} for i in range(27)]
+    fake_report.github_ = fake_github({"/repos/dbsystel/playground/contributors": contributors})
+
+    maintainer_dominance(fake_report)
+
+    # Only one page of contributors is requested
+    assert [req["parameters"] for req in fake_report.github_.requester.requests] == [
+        {"per_page": 30}
+    ]
+    # Bots are filtered out, only the first 11 humans are kept
+    assert fake_report.contributors_ == [{"login": "alice", "contributions": 100}] + [
+        {"login": f"dev{i}", "contributions": 2} for i in range(10)
+    ]
+    # Next 10 developers made 20% of the contributions of the main developer
+    assert fake_report.maintainer_dominance == 0.8
+
+
+def test_maintainer_dominance_empty(fake_report: RepoReport, fake_github):
+    """An empty repository returns no content instead of contributors"""
+    fake_report.github_ = fake_github({"/repos/dbsystel/playground/contributors": None})
+
+    maintainer_dominance(fake_report)
+
+    assert not fake_report.contributors_
+    assert fake_report.maintainer_dominance == 1
+
+
+def test_old_commits(tmp_path, monkeypatch):
+    """Get the age of the newest commits by humans and bots"""
+    # Fixed "today": 2024-01-01 12:00 UTC
+    monkeypatch.setattr(_contributions, "time", lambda: 1704110400)
+
+    # Commits by humans and bots with fixed author dates (UTC)
+    repo = Repo.init(tmp_path)
+    for name, date in (
+        ("Alice", "1640995200 +0000"),  # 2022-01-01
+        ("dependabot[bot]", "1654041600 +0000"),  # 2022-06-01
+        ("Bob", "1672531200 +0000"),  # 2023-01-01
+        ("renovate[bot]", "1701388800 +0000"),  # 2023-12-01
+    ):
+        author = Actor(name, f"{name}@example.com")
+        repo.index.commit(f"Commit by {name}", author=author, committer=author, author_date=date)
+
+    report = RepoReport()
+    report.repodir_ = str(tmp_path)
+    old_commits(report)
+
+    assert report.days_since_last_human_commit == 365
+    assert report.days_since_last_bot_commit == 31
+
+
+@pytest.mark.skipif(not shutil.which("ssh-keygen"), reason="ssh-keygen is required for signing")
+def test_old_commits_signed(tmp_path, monkeypatch):
+    """Signatures shown by git log due to user configuration are ignored"""
+    repo = Repo.init(tmp_path / "repo")
+    if repo.git.version_info < (2, 34):
+        pytest.skip("Signing commits with SSH keys requires git 2.34")
+    monkeypatch.setattr(_contributions, "time", lambda: 1704110400)
+
+    # Sign commits with a new SSH key, and always show signatures in git log
+    key = tmp_path / "key"
+    subprocess.run(["ssh-keygen", "-q", "-t", "ed25519", "-N", "", "-f", str(key)], check=True)
+    with repo.config_writer() as config:
+        config.set_value("gpg", "format", "ssh")
+        config.set_value("user", "signingkey", str(key))
+        config.set_value("log", "showSignature", "true")
+    with repo.git.custom_environment(
+        GIT_AUTHOR_NAME="Alice",
+        GIT_AUTHOR_EMAIL="alice@example.com",
+        GIT_AUTHOR_DATE="1672531200 +0000",  # 2023-01-01
+        GIT_COMMITTER_NAME="Alice",
+        GIT_COMMITTER_EMAIL="alice@example.com",
+    ):
+        repo.git.commit("--allow-empty", "-S", "-m", "Signed commit")
+    assert "signature" in repo.git.log().lower()
+
+    report = RepoReport()
+    report.repodir_ = repo.working_tree_dir
+    old_commits(report)
+
+    assert report.days_since_last_human_commit == 365
+    assert report.days_since_last_bot_commit == -1
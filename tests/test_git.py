@@ -0,0 +1,156 @@
+# SPDX-FileCopyrightText: 2023 DB Systel GmbH
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for _git.py"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from github import RateLimitExceededException
+
+from ossrfc import _git
+from ossrfc._git import (
+    create_filelist,
+    create_repo_list,
+    deduplicate_repo_list,
+    gh_api_call,
+    gh_api_get,
+    gh_thread_login,
+    url_to_dirname,
+)
+
+
+class FakeGithubObject:  # pylint: disable=too-few-public-methods
+    """Fake PyGithub object whose API call exceeds the rate limit a number of times"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def get_things(self):
+        """Fake API call, returns an empty result"""
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RateLimitExceededException(403, {"message": "API rate limit exceeded"}, {})
+        return []
+
+
+def test_create_repo_list(tmp_path):
+    """Compile list of one or multiple repositories depending on given arguments"""
+    repofile = tmp_path / "repos.txt"
+    repofile.write_text(
+        "https://github.com/dbsystel/foo\n\n# comment\n  https://github.com/dbsystel/bar  \n",
+        encoding="utf-8",
+    )
+
+    assert create_repo_list("https://github.com/dbsystel/baz", None) == [
+        "https://github.com/dbsystel/baz"
+    ]
+    assert create_repo_list(None, str(repofile)) == [
+        "https://github.com/dbsystel/foo",
+        "https://github.com/dbsystel/bar",
+    ]
+    with pytest.raises(SystemExit):
+        create_repo_list(None, str(tmp_path / "missing.txt"))
+
+
+def test_deduplicate_repo_list():
+    """Remove duplicate repositories, also by cache directory if cached"""
+    repos = [
+        "https://github.com/dbsystel/playground",
+        "https://github.com/dbsystel/oss-red-flag-checker",
+        "http://github.com/dbsystel/playground",
+        "https://github.com/dbsystel/playground",
+    ]
+
+    assert deduplicate_repo_list(repos) == repos[:3]
+    assert deduplicate_repo_list(repos, cache=True) == repos[:2]
+
+
+def test_create_filelist(tmp_path):
+    """Create a list of files in the root level of the directory and extra dirs"""
+    (tmp_path / ".github").mkdir()
+    (tmp_path / ".github" / "CONTRIBUTING.md").touch()
+    (tmp_path / "README.md").touch()
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "hello.py").touch()
+
+    assert create_filelist(str(tmp_path)) == [".github", "README.md", "src"]
+    # Non-existing directories and files are ignored as extra dirs
+    assert create_filelist(str(tmp_path), ".github", "docs", "README.md") == [
+        ".github",
+        ".github/CONTRIBUTING.md",
+        "README.md",
+        "src",
+    ]
+
+
+def test_url_to_dirname():
+    """Shorten and escape a repository URL so it can be used as a directory name"""
+    assert url_to_dirname("https://github.com/dbsystel/playground") == (
+        "github_com_dbsystel_playground"
+    )
+    assert url_to_dirname("http://example.org/foo.git?bar=*") == "example_org_foo_git_bar__"
+    assert url_to_dirname("git@example.org:foo/bar") == "git_example_org_foo_bar"
+    assert len(url_to_dirname("https://example.org/" + "a" * 300)) == 260
+
+
+def test_gh_api_call(monkeypatch):
+    """Generic wrapper to make GitHub API calls while catching API limits"""
+    monkeypatch.setattr(_git, "_gh_handle_ratelimit", lambda gthb, error_msg: None)
+
+    # An empty result is a valid result and must not be retried
+    ghobject = FakeGithubObject(failures=0)
+    assert gh_api_call(None, ghobject, "get_things") == []
+    assert ghobject.calls == 1
+
+    # Retry after exceeded rate limit
+    ghobject = FakeGithubObject(failures=2)
+    assert gh_api_call(None, ghobject, "get_things") == []
+    assert ghobject.calls == 3
+
+    # Give up after too many exceeded rate limits
+    ghobject = FakeGithubObject(failures=_git.GH_API_MAX_RETRIES)
+    with pytest.raises(RateLimitExceededException):
+        gh_api_call(None, ghobject, "get_things")
+    assert ghobject.calls == _git.GH_API_MAX_RETRIES
+
+
+def test_gh_api_get_cache(monkeypatch, tmp_path, fake_github):
+    """Cache GitHub API responses on disk and make conditional requests"""
+    monkeypatch.setattr(_git, "_cache_root", lambda: tmp_path)
+    gthb = fake_github({"/foo": [{"login": "foo"}]}, etag='"abc"')
+    requests = gthb.requester.requests
+
+    # Without cache, no conditional request is made
+    assert gh_api_get(gthb, "/foo", cache=False) == [{"login": "foo"}]
+    assert gh_api_get(gthb, "/foo", cache=False) == [{"login": "foo"}]
+    assert [req["headers"] for req in requests] == [{}, {}]
+    assert not (tmp_path / "github_api").exists()
+
+    # First cached request stores the response, the second one uses it
+    requests.clear()
+    assert gh_api_get(gthb, "/foo", parameters={"per_page": 30}, cache=True) == [{"login": "foo"}]
+    assert gh_api_get(gthb, "/foo", parameters={"per_page": 30}, cache=True) == [{"login": "foo"}]
+    assert [req["headers"] for req in requests] == [{}, {"If-None-Match": '"abc"'}]
+
+    # Changed response is fetched and cached again
+    gthb.requester.etag, gthb.requester.responses["/foo"] = '"def"', [{"login": "bar"}]
+    assert gh_api_get(gthb, "/foo", parameters={"per_page": 30}, cache=True) == [{"login": "bar"}]
+    assert gh_api_get(gthb, "/foo", parameters={"per_page": 30}, cache=True) == [{"login": "bar"}]
+
+    # Empty response without ETag, e.g. 204 No Content, is not taken as
+    # unchanged, and the outdated cache entry is removed
+    gthb.requester.etag, gthb.requester.responses["/foo"] = "", None
+    assert gh_api_get(gthb, "/foo", parameters={"per_page": 30}, cache=True) is None
+    assert not list((tmp_path / "github_api").iterdir())
+
+
+def test_gh_thread_login():
+    """Each thread gets its own Github object, which is re-used within the thread"""
+    assert gh_thread_login() is gh_thread_login()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_thread = executor.submit(gh_thread_login).result()
+    assert other_thread is not gh_thread_login()
@@ -4,9 +4,92 @@
 
 """Tests for _matching.py"""
 
-from ossrfc._licensing import cla_in_files, dco_in_files, inoutbound
+import pytest
+from github import GithubException
+
+from ossrfc._licensing import (
+    _is_readme_or_contributing,
+    cla_in_files,
+    cla_or_dco_in_pulls,
+    dco_in_files,
+    inoutbound,
+    scan_license_files,
+)
 from ossrfc._report import RepoReport
 
+REPO_URL = "/repos/dbsystel/playground"
+
+
+def _graphql_pull(number: int, base: str, contexts: list) -> dict:
+    """A pull request from the GraphQL API with a single commit and its check
+    runs and statuses"""
+    commit = {
+        "oid": "abc123",
+        "url": "https://github.com/dbsystel/playground/commit/abc123",
+        "statusCheckRollup": {"contexts": {"nodes": contexts}},
+    }
+    return {"number": number, "baseRefName": base, "commits": {"nodes": [{"commit": commit}]}}
+
+
+def _graphql_response(query: dict) -> dict:
+    """Fake GraphQL API response. The newest pull request is not against the
+    default branch"""
+    if "base" not in query["variables"]:
+        pull = _graphql_pull(2, "feature", [])
+    else:
+        pull = _graphql_pull(
+            1,
+            "main",
+            [
+                {
+                    "__typename": "CheckRun",
+                    "name": "license/cla",
+                    "title": "Contributor License Agreement is signed.",
+                    "summary": None,
+                    "url": "https://github.com/dbsystel/playground/runs/1",
+                },
+                {"__typename": "StatusContext", "context": "DCO", "description": "passed"},
+            ],
+        )
+    repository = {"defaultBranchRef": {"name": "main"}, "pullRequests": {"nodes": [pull]}}
+    return {"data": {"repository": repository}}
+
+
+def _rest_pulls_response(parameters: dict) -> list:
+    """Fake REST API response for pull requests. There is no pull request
+    against the default branch"""
+    if "base" in parameters:
+        return []
+    return [
+        {
+            "number": 2,
+            "html_url": "https://github.com/dbsystel/playground/pull/2",
+            "head": {"sha": "abc123"},
+        }
+    ]
+
+
+REST_RESPONSES = {
+    REPO_URL: {"default_branch": "main"},
+    f"{REPO_URL}/pulls": _rest_pulls_response,
+    f"{REPO_URL}/commits/abc123/check-runs": {
+        "check_runs": [
+            {
+                "name": "DCO",
+                "output": {"title": "All commits have a Signed-off-by", "summary": None},
+                "html_url": "https://github.com/dbsystel/playground/runs/1",
+            }
+        ]
+    },
+    f"{REPO_URL}/commits/abc123/statuses": [
+        {
+            "context": "license/cla",
+            "description": "Contributor License Agreement is signed.",
+            "url": f"https://api.github.com{REPO_URL}/statuses/abc123",
+        }
+    ],
+}
+
 
 def test_cla_in_files(fake_report: RepoReport):
     """Search for CLA requirements in README and CONTRIBUTING files"""
@@ -75,3 +158,109 @@ def test_inoutbound(fake_report: RepoReport):
             ],
         },
     ]
+
+
+def test_scan_license_files(fake_report: RepoReport):
+    """Search for CLA, DCO and inbound=outbound in README and CONTRIBUTING files
+    in one go"""
+
+    scan_license_files(fake_report, cla=True, dco=True, inbound_outbound=True)
+
+    assert (
+        fake_report.cla_searched_files_
+        == fake_report.dco_searched_files_
+        == fake_report.inoutbound_searched_files_
+        == ["CONTRIBUTING.adoc", "CONTRIBUTING.md", "README.adoc", "README.md"]
+    )
+    assert [finding["file"] for finding in fake_report.cla_files] == [
+        "CONTRIBUTING.adoc",
+        "README.md",
+    ]
+    assert [finding["file"] for finding in fake_report.dco_files] == ["CONTRIBUTING.md"]
+    assert [finding["file"] for finding in fake_report.inoutbound_files] == ["README.adoc"]
+
+
+def test_scan_license_files_disabled(fake_report: RepoReport):
+    """Disabled searches do not touch the report"""
+
+    scan_license_files(fake_report, dco=True)
+
+    assert not fake_report.cla_searched_files_
+    assert not fake_report.cla_files
+    assert not fake_report.inoutbound_searched_files_
+    assert fake_report.dco_files
+
+
+def test_cla_or_dco_in_pulls_graphql(fake_report: RepoReport, fake_github):
+    """Search for CLA or DCO requirements in Pull Requests via GraphQL API"""
+    fake_report.github_ = fake_github({"/graphql": _graphql_response})
+    fake_report.github_authenticated_ = True
+
+    cla_or_dco_in_pulls(fake_report)
+
+    # Second query searches for pull requests against the default branch
+    assert [req["input"]["variables"] for req in fake_report.github_.requester.requests] == [
+        {"owner": "dbsystel", "name": "playground"},
+        {"owner": "dbsystel", "name": "playground", "base": "main"},
+    ]
+    assert fake_report.cla_pulls == [
+        {
+            "pull_request": 1,
+            "type": "action",
+            "url": "https://github.com/dbsystel/playground/runs/1",
+            "indicators": ["Contributor License Agreement is signed.", "license/cla"],
+        }
+    ]
+    assert fake_report.dco_pulls == [
+        {
+            "pull_request": 1,
+            "type": "status",
+            "url": "https://api.github.com/repos/dbsystel/playground/statuses/abc123",
+            "indicators": ["DCO"],
+        }
+    ]
+
+
+@pytest.mark.parametrize("authenticated", [False, True])
+def test_cla_or_dco_in_pulls_rest(fake_report: RepoReport, fake_github, authenticated: bool):
+    """Search for CLA or DCO requirements in Pull Requests via REST API, either
+    because there is no authentication or because the GraphQL API failed"""
+    fake_report.github_ = fake_github(
+        {**REST_RESPONSES, "/graphql": GithubException(401, {"message": "Failed"}, None)}
+    )
+    fake_report.github_authenticated_ = authenticated
+
+    cla_or_dco_in_pulls(fake_report)
+
+    # GraphQL API is only tried if authenticated
+    requests = fake_report.github_.requester.requests
+    assert any(req["url"] == "/graphql" for req in requests) == authenticated
+    # No pull request against the default branch, so search without base
+    assert [req["parameters"].get("base") for req in requests if req["url"].endswith("/pulls")] == [
+        "main",
+        None,
+    ]
+    assert fake_report.cla_pulls == [
+        {
+            "pull_request": 2,
+            "type": "status",
+            "url": "https://api.github.com/repos/dbsystel/playground/statuses/abc123",
+            "indicators": ["Contributor License Agreement is signed.", "license/cla"],
+        }
+    ]
+    assert fake_report.dco_pulls == [
+        {
+            "pull_request": 2,
+            "type": "action",
+            "url": "https://github.com/dbsystel/playground/runs/1",
+            "indicators": ["All commits have a Signed-off-by", "DCO"],
+        }
+    ]
+
+
+def test_is_readme_or_contributing():
+    """Detect README and CONTRIBUTING files, also in sub-directories"""
+    for path in ("README", "readme.md", "docs/CONTRIBUTING.adoc", ".github/Contributing.MD"):
+        assert _is_readme_or_contributing(path)
+    for path in ("README.md.bak", "README.", "README_de.md", "readme.rst2", "readme/LICENSE"):
+        assert not _is_readme_or_contributing(path)
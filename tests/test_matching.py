@@ -4,7 +4,13 @@
 
 """Tests for _matching.py"""
 
-from ossrfc._matching import find_patterns_in_list, lines_as_list
+from ossrfc._matching import (
+    combine_patterns,
+    find_pattern_in_list,
+    find_patterns_in_list,
+    iter_lines,
+    lines_as_list,
+)
 
 
 def test_find_patterns_in_list(cla_keywords, cla_input_data_match_true, cla_input_data_match_false):
@@ -43,6 +49,39 @@ def test_find_patterns_in_list(cla_keywords, cla_input_data_match_true, cla_inpu
     assert find_patterns_in_list([r"no_match_pattern"], *cla_input_data_match_true) == []
 
 
+def test_combine_patterns(cla_keywords, cla_input_data_match_true, cla_input_data_match_false):
+    """Combine a list of regex patterns into a single pattern with alternations"""
+    cla_regex = combine_patterns(cla_keywords)
+
+    # The combined pattern matches the same strings as the pattern list
+    for data in (cla_input_data_match_true, cla_input_data_match_false):
+        assert find_pattern_in_list(cla_regex, *data) == find_patterns_in_list(cla_keywords, *data)
+
+    # Global inline flags only apply to their own pattern
+    regex = combine_patterns([r"(?i)^foo$", r"^bar$"])
+    assert regex.search("FOO")
+    assert regex.search("bar")
+    assert not regex.search("BAR")
+
+
+def test_find_pattern_in_list(cla_keywords):
+    """Search for a single pattern in one or multiple strings"""
+    cla_regex = combine_patterns(cla_keywords)
+
+    assert find_pattern_in_list(cla_regex) == []
+    assert find_pattern_in_list(cla_regex, "", "No CLArity") == []
+    assert find_pattern_in_list(cla_regex, "user: cla-bot", "", "## CLA") == [
+        "## CLA",
+        "user: cla-bot",
+    ]
+
+    # Patterns as strings are supported as well
+    assert find_pattern_in_list(r"^(LICENSE|COPYING)", "src", "LICENSES", "COPYING") == [
+        "COPYING",
+        "LICENSES",
+    ]
+
+
 def test_lines_as_list(fake_repository):
     """Return all lines of a file as list of lines"""
     assert lines_as_list(fake_repository / "README.md") == [
@@ -50,3 +89,11 @@ def test_lines_as_list(fake_repository):
         "",
         "You have to sign a CLA in order to contribute",
     ]
+
+
+def test_iter_lines(fake_repository):
+    """Yield the lines of a file one by one"""
+    lines = iter_lines(fake_repository / "README.md")
+
+    assert next(lines) == "# Project Name"
+    assert list(lines) == ["", "You have to sign a CLA in order to contribute"]
@@ -4,7 +4,9 @@
 
 """Tests for _matching.py"""
 
-from ossrfc._report import RepoReport
+import json
+
+from ossrfc._report import RepoReport, print_json_report, print_text_analysis
 
 
 def test_report(fake_report: RepoReport):
@@ -20,3 +22,38 @@ def test_report(fake_report: RepoReport):
         "README.md",
         "src",
     ]
+
+
+def test_print_text_analysis(fake_report: RepoReport, capsys):
+    """Findings are printed by severity, ignored ones are only counted"""
+    fake_report.analysis = [
+        {"category": "A", "indicator": "green", "severity": "green", "ignored": False},
+        {"category": "B", "indicator": "red", "severity": "red", "ignored": False},
+        {"category": "C", "indicator": "yellow", "severity": "yellow", "ignored": False},
+        {"category": "D", "indicator": "ignored", "severity": "red", "ignored": True},
+    ]
+    fake_report.impossible_checks_ = ["contributions"]
+
+    print_text_analysis([fake_report])
+
+    assert capsys.readouterr().out.splitlines()[2:] == [
+        "* 🚩 B: red",
+        "* ⚠️ C: yellow",
+        "* ✔ A: green",
+        "* 💡 There were 1 finding(s) that you explicitely ignored",
+        "* 💡 The follow checks could not be executed: contributions",
+    ]
+
+
+def test_print_json_report(fake_report: RepoReport, capsys):
+    """Technical attributes are only printed in debug mode, never the Github object"""
+    fake_report.ignorelist_ = frozenset(["dco", "cla"])
+
+    print_json_report([fake_report], [], False, [])
+    report = json.loads(capsys.readouterr().out)["repositories"][0]
+    assert not [key for key in report if key.endswith("_")]
+
+    print_json_report([fake_report], [], True, ["cla", "dco"])
+    report = json.loads(capsys.readouterr().out)["repositories"][0]
+    assert report["ignorelist_"] == ["cla", "dco"]
+    assert "github_" not in report